@@ -1,15 +1,15 @@
 import os
-import importlib.util
+import sys
+import importlib
 
 
 def import_srt_tools():
-    # Locate the extension main.py within the extension folder
-    base = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'tts_webui_extension', 'srt_tools', 'main.py'))
-    spec = importlib.util.spec_from_file_location('srt_tools_main', base)
-    mod = importlib.util.module_from_spec(spec)
-    assert spec and spec.loader
-    spec.loader.exec_module(mod)  # type: ignore
-    return mod
+    # Import the gradio-free processing module by its package name, so that process pool
+    # workers can unpickle functions from it
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    if root not in sys.path:
+        sys.path.insert(0, root)
+    return importlib.import_module('tts_webui_extension.srt_tools.processing')
 
 
 def test_parse_srt_basic():
@@ -40,3 +40,147 @@ def test_parse_srt_ignores_malformed():
     segments = mod.parse_srt_content(srt)
     assert len(segments) == 1
     assert segments[0]['text'].startswith('Valid')
+
+
+def test_parse_srt_leading_bom():
+    mod = import_srt_tools()
+    srt = """\ufeff1\n00:00:01,000 --> 00:00:02,000\nWith BOM\n"""
+    segments = mod.parse_srt_content(srt)
+    assert len(segments) == 1
+    assert segments[0]['text'] == 'With BOM'
+
+
+def test_segment_attribute_and_key_access():
+    mod = import_srt_tools()
+    srt = """1\n00:00:01,000 --> 00:00:02,000\nHello\n"""
+    seg = mod.parse_srt_content(srt)[0]
+    assert seg.index == seg['index'] == 1
+    assert seg.text == seg['text'] == 'Hello'
+    assert seg._asdict() == {
+        'index': 1, 'start': '00:00:01,000', 'end': '00:00:02,000', 'text': 'Hello', 'start_ms': 1000, 'end_ms': 2000,
+    }
+
+
+def test_parse_srt_timecode_milliseconds():
+    mod = import_srt_tools()
+    srt = """1\n01:02:03,456 -->  10:00:00,001\nIrregular arrow spacing\n"""
+    segments = mod.parse_srt_content(srt)
+    assert segments[0]['start_ms'] == 3723456
+    assert segments[0]['end_ms'] == 36000001
+
+
+def test_parse_srt_bytes_matches_parse():
+    mod = import_srt_tools()
+    srt = """\ufeff1\r\n00:00:01,000 --> 00:00:02,000\r\nCafé\r\nau lait\r\n\r\n2\r\n00:00:03,000 --> 00:00:04,000\r\nSecond\r\n"""
+    segments = mod.parse_srt_bytes(srt.encode('utf-8'))
+    assert segments == mod.parse_srt_content(srt)
+    assert len(segments) == 2
+    assert segments[0]['text'] == 'Café au lait'
+
+
+def test_write_segments_iter_to_json_matches_list_writer(tmp_path):
+    import json
+    mod = import_srt_tools()
+    srt = """1\n00:00:01,000 --> 00:00:02,000\nFirst\n\n2\n00:00:03,000 --> 00:00:04,000\nSecond\n"""
+    segments = mod.parse_srt_content(srt)
+    streamed = tmp_path / 'streamed.json'
+    listed = tmp_path / 'listed.json'
+    count = mod.write_segments_iter_to_json(mod.parse_srt_iter(srt), str(streamed))
+    mod.write_segments_to_json(segments, str(listed))
+    assert count == 2
+    assert streamed.read_bytes() == listed.read_bytes()
+    assert json.loads(streamed.read_text(encoding='utf-8'))[1]['text'] == 'Second'
+
+
+def test_parse_srt_skips_non_ascii_digits():
+    mod = import_srt_tools()
+    srt = """1\n0²:00:01,000 --> 00:00:02,000\nSuperscript\n\n2\n٠٠:00:01,000  -->  00:00:02,000\nArabic-Indic\n\n3\n00:00:03,000 --> 00:00:04,000\nValid\n"""
+    segments = mod.parse_srt_content(srt)
+    assert len(segments) == 1
+    assert segments[0]['text'] == 'Valid'
+
+
+def test_parse_srt_normalizes_multiline_text():
+    mod = import_srt_tools()
+    srt = """1\n00:00:01,000 --> 00:00:02,000\n  a  \n \n  b\n"""
+    segments = mod.parse_srt_content(srt)
+    assert segments[0]['text'] == 'a b'
+
+
+def test_parse_srt_bytes_mixed_line_endings():
+    mod = import_srt_tools()
+    lf_first = b"1\n00:00:01,000 --> 00:00:02,000\nA\n\n2\r\n00:00:03,000 --> 00:00:04,000\r\nB\r\n\r\n3\r\n00:00:05,000 --> 00:00:06,000\r\nC\r\n"
+    crlf_first = b"1\r\n00:00:01,000 --> 00:00:02,000\r\nA\r\n\r\n2\n00:00:03,000 --> 00:00:04,000\nB\n\n3\n00:00:05,000 --> 00:00:06,000\nC\n"
+    cr_only = b"1\r00:00:01,000 --> 00:00:02,000\rA\r\r2\r00:00:03,000 --> 00:00:04,000\rB\r\r3\r00:00:05,000 --> 00:00:06,000\rC\r"
+    for data in (lf_first, crlf_first, cr_only):
+        segments = mod.parse_srt_bytes(data)
+        assert [seg['text'] for seg in segments] == ['A', 'B', 'C']
+        assert segments == mod.parse_srt_content(data.decode('utf-8'))
+
+
+def test_process_srt_files_summary(tmp_path):
+    mod = import_srt_tools()
+    good = tmp_path / 'good.srt'
+    good.write_text("1\n00:00:01,000 --> 00:00:02,000\nOne\n\n2\n00:00:03,000 --> 00:00:04,000\nTwo\n", encoding='utf-8')
+    notes = tmp_path / 'notes.txt'
+    notes.write_text('not a subtitle', encoding='utf-8')
+    missing = tmp_path / 'missing.srt'
+    summary = mod.process_srt_files([str(good), str(notes), str(missing)], str(tmp_path / 'out'))
+    assert summary['file_count'] == 2
+    assert summary['total_segments'] == 2
+    assert [entry['file'] for entry in summary['files']] == ['good.srt', 'missing.srt']
+    assert summary['files'][0]['segments'] == 2
+    assert 'error' in summary['files'][1]
+
+
+def test_process_srt_files_process_pool(tmp_path, monkeypatch):
+    mod = import_srt_tools()
+    monkeypatch.setattr(mod, 'PROCESS_POOL_MIN_BYTES', 0)
+    paths = []
+    for i in range(3):
+        path = tmp_path / f'f{i}.srt'
+        path.write_text(f"1\n00:00:0{i},000 --> 00:00:09,000\nFile {i}\n", encoding='utf-8')
+        paths.append(str(path))
+    paths.insert(1, str(tmp_path / 'missing.srt'))
+    summary = mod.process_srt_files(paths, str(tmp_path / 'out'))
+    assert [entry['file'] for entry in summary['files']] == ['f0.srt', 'missing.srt', 'f1.srt', 'f2.srt']
+    assert 'error' in summary['files'][1]
+    assert summary['total_segments'] == 3
+    assert summary['file_count'] == 4
+
+
+def test_parse_srt_ignores_whitespace_only_lines():
+    mod = import_srt_tools()
+    for blank in (' ', '\t'):
+        srt = f"1\n00:00:01,000 --> 00:00:02,000\nA\n\n{blank}\n2\n{blank}\n00:00:03,000 --> 00:00:04,000\nB\n"
+        for segments in (mod.parse_srt_content(srt), mod.parse_srt_bytes(srt.encode('utf-8'))):
+            assert [seg['text'] for seg in segments] == ['A', 'B']
+    leading = " \n1\n00:00:01,000 --> 00:00:02,000\nFirst\n"
+    assert [seg['text'] for seg in mod.parse_srt_content(leading)] == ['First']
+
+
+def test_parse_srt_signed_index_lines():
+    mod = import_srt_tools()
+    srt = """+2\n00:00:01,000 --> 00:00:02,000\nPlus\n\n-1\n00:00:03,000 --> 00:00:04,000\nMinus\n"""
+    segments = mod.parse_srt_content(srt)
+    assert [seg['text'] for seg in segments] == ['Plus', 'Minus']
+    assert [seg['index'] for seg in segments] == [1, 2]
+
+
+def test_write_segments_iter_to_json_keeps_old_file_on_error(tmp_path):
+    mod = import_srt_tools()
+    out = tmp_path / 'out.json'
+    out.write_text('[]', encoding='utf-8')
+
+    def failing():
+        yield from mod.parse_srt_iter("1\n00:00:01,000 --> 00:00:02,000\nFirst\n")
+        raise ValueError('broken input')
+
+    try:
+        mod.write_segments_iter_to_json(failing(), str(out))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('expected ValueError')
+    assert out.read_text(encoding='utf-8') == '[]'
+    assert os.listdir(tmp_path) == ['out.json']
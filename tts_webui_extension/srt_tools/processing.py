@@ -0,0 +1,287 @@
+"""SRT parsing and JSON export, kept free of UI imports.
+
+Process pool workers import this module, so it must not pull in gradio.
+"""
+import os
+import codecs
+import contextlib
+import itertools
+import json
+import mmap
+import multiprocessing
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List, Dict, NamedTuple
+
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib encoder
+    orjson = None
+
+
+class Segment(NamedTuple):
+    """A parsed subtitle block.
+
+    This is a tuple, not a dict: besides attribute access, only ``seg["text"]`` style lookup
+    of the fields is supported. Use ``seg._asdict()`` where a real dict is needed, e.g. for
+    ``json.dumps`` (which would otherwise encode the segment as a list).
+    """
+
+    index: int
+    start: str
+    end: str
+    text: str
+    start_ms: int
+    end_ms: int
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            if key not in self._fields:
+                raise KeyError(key)
+            return getattr(self, key)
+        return tuple.__getitem__(self, key)
+
+
+# One well-formed block of LF-only content, found with finditer. A block starts at the beginning
+# of the content or where a run of blank lines ends: an optional index line (anything int()
+# accepts) and the timecode line, each possibly preceded by whitespace-only lines, then the text
+# lines up to the next blank line. No part of the pattern can run past a blank line, so
+# malformed blocks are simply skipped by the search and the search stays linear.
+BLOCK_PATTERN = re.compile(
+    r"(?:^\n*|(?<=\n\n)(?!\n))(?:[^\S\n]+\n)*"
+    r"(?:[^\S\n]*[+-]?\d+[^\S\n]*\n(?:[^\S\n]+\n)*)?"
+    r"[ \t]*(?P<start>([0-9]{2}:[0-9]{2}):([0-9]{2}),([0-9]{3}))[^\S\n]+-->[^\S\n]+"
+    r"(?P<end>([0-9]{2}:[0-9]{2}):([0-9]{2}),([0-9]{3}))[ \t]*"
+    r"(?:\n(?P<text>.+(?:\n.+)*))?"
+)
+
+# "HH:MM" -> milliseconds; a file only spans a few hundred distinct minutes
+_MINUTE_MS: Dict[str, int] = {}
+
+
+def _minute_ms(key: str) -> int:
+    """Convert an ``HH:MM`` timecode prefix to milliseconds and cache it in ``_MINUTE_MS``."""
+    value = _MINUTE_MS[key] = (int(key[:2]) * 60 + int(key[3:])) * 60000
+    return value
+
+
+def _scan_segments(content: str, first_index: int) -> Iterator[Segment]:
+    """Yield the segments of LF-only ``content``, numbering them from ``first_index``."""
+    index = first_index
+    # Segment._make without its per-call length check; the tuple below always has every field
+    new_tuple = tuple.__new__
+    minute_ms = _MINUTE_MS
+    for m in BLOCK_PATTERN.finditer(content):
+        start, hm1, s1, f1, end, hm2, s2, f2, text = m.groups()
+        if text is None:
+            continue
+        if "\n" in text:
+            # Multi-line caption: strip each line, drop blank ones, join with single spaces
+            text = " ".join(filter(None, map(str.strip, text.split("\n"))))
+        else:
+            text = text.strip()
+        if not text:
+            continue
+        try:
+            start_ms = minute_ms[hm1]
+        except KeyError:
+            start_ms = _minute_ms(hm1)
+        try:
+            end_ms = minute_ms[hm2]
+        except KeyError:
+            end_ms = _minute_ms(hm2)
+        # Seconds and milliseconds are read as one number: int("SS" + "mmm") == SS * 1000 + mmm
+        yield new_tuple(
+            Segment, (index, start, end, text, start_ms + int(s1 + f1), end_ms + int(s2 + f2))
+        )
+        index += 1
+
+
+def parse_srt_iter(content: str) -> Iterator[Segment]:
+    """Lazily parse raw SRT file content into segments.
+
+    Each Segment contains: index (int, sequential from 1), start (str), end (str), text (str),
+    and start_ms/end_ms (int) with the timecodes in milliseconds.
+
+    The parser is intentionally tolerant: it skips malformed blocks instead of raising.
+    Blocks are found with a single ``finditer`` pass over the content that also validates them
+    and captures their fields; only multi-line text is split into lines.
+    """
+    # Only the very start of the file can carry a BOM
+    if content.startswith("\ufeff"):
+        content = content[1:]
+    # Normalize newlines; LF-only files skip both full copies
+    if "\r" in content:
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
+    return _scan_segments(content, 1)
+
+
+def parse_srt_content(content: str) -> List[Segment]:
+    """Parse raw SRT file content into a list of segments; see ``parse_srt_iter``."""
+    return list(parse_srt_iter(content))
+
+
+def parse_srt_bytes_iter(data: bytes) -> Iterator[Segment]:
+    """Lazily parse raw UTF-8 SRT file bytes into segments, same as ``parse_srt_iter``.
+
+    The bytes are cut into chunks at blank lines (``\\n\\n`` or ``\\n\\r\\n``, SRT structure
+    is ASCII) and only one chunk at a time is decoded and normalized, so the whole file never has
+    to exist as a str. Any mix of LF, CRLF and CR endings parses like ``parse_srt_content``.
+    ``data`` may also be an ``mmap``; segments hold no references into it.
+    """
+    pos = len(codecs.BOM_UTF8) if data[: len(codecs.BOM_UTF8)] == codecs.BOM_UTF8 else 0
+    length = len(data)
+    # Next blank line of each kind; re-searched only once the scan has moved past it
+    lf = data.find(b"\n\n", pos)
+    crlf = data.find(b"\n\r\n", pos)
+    index = 1
+
+    while pos < length:
+        if 0 <= lf < pos:
+            lf = data.find(b"\n\n", pos)
+        if 0 <= crlf < pos:
+            crlf = data.find(b"\n\r\n", pos)
+        if crlf == -1 or 0 <= lf < crlf:
+            chunk_end, sep_len = (lf, 2) if lf != -1 else (length, 0)
+        else:
+            chunk_end, sep_len = crlf, 3
+        chunk = data[pos:chunk_end].decode("utf-8", errors="ignore")
+        # CR-only line breaks inside a chunk may still separate blocks; the scan below splits them
+        if "\r" in chunk:
+            chunk = chunk.replace("\r\n", "\n").replace("\r", "\n")
+        for seg in _scan_segments(chunk, index):
+            index += 1
+            yield seg
+        pos = chunk_end + sep_len
+
+
+def parse_srt_bytes(data: bytes) -> List[Segment]:
+    """Parse raw UTF-8 SRT file bytes into a list of segments; see ``parse_srt_bytes_iter``."""
+    return list(parse_srt_bytes_iter(data))
+
+
+def write_segments_to_json(segments: List[Segment], output_path: str) -> None:
+    """Write segments as a JSON list of objects; the parent directory must already exist."""
+    records = [seg._asdict() for seg in segments]
+    if orjson is not None:
+        data = orjson.dumps(records, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(records, ensure_ascii=False, indent=2).encode("utf-8")
+    with open(output_path, "wb") as f:
+        f.write(data)
+
+
+def _encode_record(record: Dict) -> bytes:
+    """Encode one record exactly as it appears inside an indented JSON list, minus brackets."""
+    if orjson is not None:
+        return orjson.dumps([record], option=orjson.OPT_INDENT_2)[2:-2]
+    return json.dumps([record], ensure_ascii=False, indent=2)[2:-2].encode("utf-8")
+
+
+def write_segments_iter_to_json(segments: Iterable[Segment], output_path: str) -> int:
+    """Stream segments into a JSON file one at a time and return how many were written.
+
+    Produces the same file as ``write_segments_to_json`` without materializing the segments.
+    The JSON is written to a temporary file next to ``output_path`` and only renamed over it
+    once complete, so an error while parsing leaves no truncated file (nor clobbers an old one).
+    """
+    # Unique per writer, in case two inputs of one batch map to the same output name
+    tmp_path = f"{output_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    count = 0
+    try:
+        with open(tmp_path, "wb") as f:
+            for seg in segments:
+                f.write(b",\n" if count else b"[\n")
+                f.write(_encode_record(seg._asdict()))
+                count += 1
+            f.write(b"\n]" if count else b"[]")
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
+    return count
+
+
+# Batches with less input than this run inline: spawning worker processes costs more than it
+# saves, and threads gain nothing as parsing holds the GIL and local reads/writes are fast
+PROCESS_POOL_MIN_BYTES = 64 * 1024 * 1024
+
+
+def _process_one(path: str, output_dir: str) -> Dict:
+    """Parse a single SRT file and write its JSON; returns the per-file summary entry.
+
+    Module-level so it can be pickled into ProcessPoolExecutor workers.
+    """
+    name = os.path.basename(path)
+    out_path = os.path.join(output_dir, f"{os.path.splitext(name)[0]}.json")
+    try:
+        with open(path, "rb") as f:
+            # mmap lets the OS page the file in as it is scanned instead of copying it whole
+            if os.fstat(f.fileno()).st_size == 0:  # empty files cannot be mapped
+                count = write_segments_iter_to_json((), out_path)
+            else:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    # Each segment is encoded as soon as it is parsed; no list is built
+                    count = write_segments_iter_to_json(parse_srt_bytes_iter(mm), out_path)
+        return {
+            "file": name,
+            "segments": count,
+            "output_json": out_path,
+        }
+    except Exception as e:
+        return {
+            "file": name,
+            "error": str(e),
+            "segments": 0,
+        }
+
+
+def _total_size(paths: List[str]) -> int:
+    """Sum the sizes of the files that exist; missing ones are reported later by _process_one."""
+    total = 0
+    for path in paths:
+        try:
+            total += os.path.getsize(path)
+        except OSError:
+            pass
+    return total
+
+
+def process_srt_files(file_paths: List[str], output_dir: str) -> Dict:
+    """Process multiple SRT files and write JSON per file; large batches run in a process pool.
+
+    Args:
+        file_paths: list of raw .srt file paths.
+        output_dir: destination directory for JSON outputs (created if absent).
+
+    Returns summary dict including per-file stats in input order, file_count and total_segments.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    # Lowercase only the 4-char suffix rather than the whole path
+    paths = [path for path in file_paths if path[-4:].lower() == ".srt"]
+    files: List[Dict] = []
+    total_segments = 0
+
+    if len(paths) <= 1 or _total_size(paths) < PROCESS_POOL_MIN_BYTES:
+        executor = None
+    else:
+        # Spawned workers only need this module, never gradio, and spawning avoids forking
+        # the multi-threaded web server
+        executor = ProcessPoolExecutor(
+            max_workers=min(len(paths), os.cpu_count() or 1),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    with executor if executor is not None else contextlib.nullcontext():
+        mapper = executor.map if executor is not None else map
+        # Results arrive in input order; stats are aggregated as they come in
+        for entry in mapper(_process_one, paths, itertools.repeat(output_dir)):
+            files.append(entry)
+            total_segments += entry["segments"]
+    return {
+        "output_dir": output_dir,
+        "files": files,
+        "total_segments": total_segments,
+        "file_count": len(files),
+    }